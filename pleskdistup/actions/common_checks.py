@@ -69,9 +69,7 @@ class AssertMinPhpVersion(action.CheckAction):
             return True
 
         php_hanlers = {"'{}-fastcgi'", "'{}-fpm'", "'{}-fpm-dedicated'"}
-        outdated_php_handlers = []
-        for installed in installed_pkgs:
-            outdated_php_handlers += [handler.format(installed) for handler in php_hanlers]
+        outdated_php_handlers = [handler.format(installed) for installed in installed_pkgs for handler in php_hanlers]
         log.debug(f"Outdated PHP handlers: {outdated_php_handlers}")
 
         try:
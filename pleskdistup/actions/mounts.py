@@ -51,11 +51,7 @@ Or you could skip the check by calling the tool with --allow-raid-devices option
             # Might be a problem, but it is not something we checking in scope of this check
             return True
 
-        raid_devices_in_fstab = []
-        with open(FSTAB_PATH, "r") as fstab_file:
-            for line in fstab_file.readlines():
-                if line.startswith("/dev/md"):
-                    raid_devices_in_fstab.append(line.rstrip())
+        raid_devices_in_fstab = [entry.line for entry in mounts.read_fstab_entries(FSTAB_PATH) if entry.device.startswith("/dev/md")]
 
         if len(raid_devices_in_fstab) == 0:
             return True
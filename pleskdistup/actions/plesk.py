@@ -492,13 +492,12 @@ class AssertPleskVersionIsAvailable(action.CheckAction):
             if available_versions == []:
                 log.warn("Unable to retrieve available versions from autoinstall.plesk.com")
                 return False
-            current_version = plesk.get_plesk_version()
             # The product list does not contain information about hotfixes, so our comparison can't be so accurate
             # However, we are attempting to determine if the Plesk repository is accessible. Repositories are
             # linked to the main part of the version (e.g., 18.0.50,18.0.51) and are shared between hotfix
             # Therefore, we should not compare hotfix part in this case, as we are aware that the repository
             # for the currently installed version is available.
-            current_version.hotfix = 0
+            current_version = plesk.get_plesk_version_fast()
 
             log.debug(f"Received available versions of plesk are: {available_versions}")
             log.debug(f"Plesk version installed on the host is '{current_version}'")
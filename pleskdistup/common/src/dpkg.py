@@ -1,5 +1,6 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 
+import collections
 import itertools
 import os
 import re
@@ -27,6 +28,32 @@ def is_package_installed(pkg: str) -> bool:
     return res.returncode == 0 and res.stdout == "installed"
 
 
+def filter_installed_packages(lookup_pkgs: typing.Iterable[str]) -> typing.List[str]:
+    pkgs = list(lookup_pkgs)
+    if not pkgs:
+        return []
+
+    # Query all packages by one dpkg-query call. It returns an error when some of the packages
+    # are unknown, but still reports the known ones, so the return code is not checked.
+    res = subprocess.run(
+        ["/usr/bin/dpkg-query", "--showformat", "${Package} ${Architecture} ${db:Status-status}\n", "--show"] + pkgs,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+    )
+    installed = set()
+    for line in res.stdout.splitlines():
+        fields = line.split(" ")
+        if len(fields) != 3 or fields[2] != "installed":
+            continue
+        name, arch, _ = fields
+        # Packages could be requested both by the bare and the arch-qualified name
+        # (e.g. "libc6:amd64"), but dpkg-query reports only the bare one in ${Package}
+        installed.add(name)
+        installed.add(f"{name}:{arch}")
+    return [pkg for pkg in pkgs if pkg in installed]
+
+
 class PackageEntry(typing.NamedTuple):
     name: str
     arch: str
@@ -36,16 +63,15 @@ class PackageEntry(typing.NamedTuple):
 def _parse_apt_get_simulation(data: str) -> typing.Dict[str, typing.List[PackageEntry]]:
     re_inst = re.compile(r"^(?P<op>Inst|Conf) (?P<name>[^ :]+)(:(?P<arch>[^ ]+))?( \[[^ ]+\])? \((?P<evr>[^ ]+) .+")
     re_remv = re.compile(r"^(?P<op>Remv|Purg) (?P<name>[^ :]+)(:(?P<arch>[^ ]+))? \[(?P<evr>[^ ]+)\]$")
-    res: typing.Dict[str, typing.List[PackageEntry]] = {}
+    res: typing.DefaultDict[str, typing.List[PackageEntry]] = collections.defaultdict(list)
     for line in data.split("\n"):
-        m = re.match(re_inst, line)
+        m = re_inst.match(line)
         if not m:
-            m = re.match(re_remv, line)
+            m = re_remv.match(line)
         if m:
-            if m["op"] not in res:
-                res[m["op"]] = []
             res[m["op"]].append(PackageEntry(m["name"], m["arch"], m["evr"]))
-    return res
+    # Return a plain dict, so lookups of missing operations by callers don't add empty entries
+    return dict(res)
 
 
 def install_packages(
@@ -253,10 +279,14 @@ def do_distupgrade(tmpfail_retry_intervals: typing.Optional[typing.List[int]] =
 
 
 def get_installed_packages_list(regex: str) -> typing.List[typing.Tuple[str, str]]:
-    pkgs_info = subprocess.check_output(["/usr/bin/dpkg-query", "-W", "-f", "${binary:Package} ${Version}\n", regex],
-                                        universal_newlines=True)
+    cmd = ["/usr/bin/dpkg-query", "-W", "-f", "${binary:Package} ${Version}\n", regex]
     result = []
-    for pkg in pkgs_info.splitlines():
-        name, version = pkg.split(" ", 1)
-        result.append((name, version))
+    # Parse the output while it is read, so the whole output isn't kept in memory next to the result
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            name, _, version = line.rstrip("\n").partition(" ")
+            result.append((name, version))
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
     return result
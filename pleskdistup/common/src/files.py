@@ -1,4 +1,5 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import collections
 import fnmatch
 import json
 import os
@@ -13,6 +14,8 @@ PathType = typing.Union[os.PathLike, str]
 
 DEFAULT_BACKUP_EXTENSION = ".conversion.bak"
 
+_CNF_SECTION_RE = re.compile(r"\s*\[\s*(?P<sec_name>\S+)\s*\]")
+
 
 def replace_string(filename: str, original_substring: str, new_substring: str) -> None:
     with open(filename, "r") as original, open(filename + ".next", "w") as dst:
@@ -50,20 +53,24 @@ def push_front_strings(filename: str, strings: typing.List[str]) -> None:
 def rewrite_json_file(filename: str, jobj: typing.Union[dict, typing.List]) -> None:
     log.debug("Going to write json '{file}' with new data".format(file=filename))
 
+    # Serialize straight into the file to avoid keeping the whole encoded document in memory
     with open(filename + ".next", "w") as dst:
-        dst.write(json.dumps(jobj, indent=4))
+        json.dump(jobj, dst, indent=4)
 
-    shutil.move(filename + ".next", filename)
+    os.replace(filename + ".next", filename)
 
 
 def get_last_lines(filename: PathType, n: int) -> typing.List[str]:
+    # The log file could be quite big, so keep only the last lines while reading it
     with open(filename) as f:
-        return f.readlines()[-n:]
+        return list(collections.deque(f, maxlen=n))
 
 
-def backup_file(filename: str, ext: str = DEFAULT_BACKUP_EXTENSION) -> None:
+def backup_file(filename: str, ext: str = DEFAULT_BACKUP_EXTENSION) -> bool:
     if os.path.exists(filename):
         shutil.copy(filename, filename + ext)
+        return True
+    return False
 
 
 def backup_exists(filename: str, ext: str = DEFAULT_BACKUP_EXTENSION) -> bool:
@@ -76,7 +83,8 @@ def restore_file_from_backup(
     ext: str = DEFAULT_BACKUP_EXTENSION,
 ) -> None:
     if os.path.exists(filename + ext):
-        shutil.move(filename + ext, filename)
+        # The backup is always next to the file, so a rename is enough
+        os.replace(filename + ext, filename)
     elif remove_if_no_backup and os.path.exists(filename):
         os.remove(filename)
 
@@ -152,16 +160,25 @@ def find_file_substrings(filename: str, substring: str) -> typing.List[str]:
     return res
 
 
+def _get_cnf_section_name(line: str) -> typing.Optional[str]:
+    # Most of lines are not section headers, so don't run the regexp for them at all
+    if "[" not in line:
+        return None
+    sec_match = _CNF_SECTION_RE.match(line)
+    return sec_match["sec_name"] if sec_match else None
+
+
 def cnf_get_section_variable(filename: str, section: str, variable: str) -> typing.Optional[str]:
+    var_re = re.compile(f"\\s*{re.escape(variable)}\\s*=\\s*(?P<value>.*)")
     with open(filename, "r") as original:
         in_section = False
-        for line in original.readlines():
-            sec_match = re.match(r"\s*\[\s*(?P<sec_name>\S+)\s*\]", line)
-            if sec_match:
-                in_section = sec_match["sec_name"] == section
+        for line in original:
+            sec_name = _get_cnf_section_name(line)
+            if sec_name is not None:
+                in_section = sec_name == section
                 continue
-            if in_section:
-                var_match = re.match(f"\\s*{variable}\\s*=\\s*(?P<value>.*)", line)
+            if in_section and "=" in line:
+                var_match = var_re.match(line)
                 if var_match:
                     return var_match["value"]
     return None
@@ -171,21 +188,22 @@ def cnf_set_section_variable(filename: str, section: str, variable: str, value:
     if not os.path.exists(filename):
         return
 
+    var_re = re.compile(f"\\s*{re.escape(variable)}\\s*=")
     with open(filename, "r") as original, open(filename + ".next", "w") as dst:
         section_found = in_section = False
         variable_found = False
-        for line in original.readlines():
-            sec_match = re.match(r"\s*\[\s*(?P<sec_name>\S+)\s*\]", line)
-            if sec_match:
+        for line in original:
+            sec_name = _get_cnf_section_name(line)
+            if sec_name is not None:
                 if in_section:
                     in_section = False
                     if not variable_found:
                         dst.write(f"{variable}={value}\n")
                 else:
-                    in_section = sec_match["sec_name"] == section
+                    in_section = sec_name == section
                     section_found = in_section is True
 
-            if in_section and re.match(f"\\s*{variable}\\s*=", line):
+            if in_section and var_re.match(line):
                 line = f"{variable}={value}\n"
                 variable_found = True
 
@@ -203,17 +221,18 @@ def cnf_unset_section_variable(filename: str, section: str, variable: str) -> No
     if not os.path.exists(filename):
         return
 
+    var_re = re.compile(f"\\s*{re.escape(variable)}\\s*=")
     with open(filename, "r") as original, open(filename + ".next", "w") as dst:
         section_found = False
-        for line in original.readlines():
-            sec_match = re.match(r"\s*\[\s*(?P<sec_name>\S+)\s*\]", line)
-            if sec_match:
+        for line in original:
+            sec_name = _get_cnf_section_name(line)
+            if sec_name is not None:
                 if section_found:
                     section_found = False
                 else:
-                    section_found = sec_match["sec_name"] == section
+                    section_found = sec_name == section
 
-            if section_found and re.match(f"\\s*{variable}\\s*=", line):
+            if section_found and var_re.match(line):
                 continue
 
             dst.write(line)
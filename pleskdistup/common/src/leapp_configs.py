@@ -1,7 +1,6 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 import os
 import json
-import shutil
 import typing
 
 from enum import IntEnum
@@ -165,15 +164,20 @@ def is_repo_ok(
     metalink: typing.Optional[str],
     mirrorlist: typing.Optional[str]
 ) -> bool:
+    return name is not None and (url is not None or metalink is not None or mirrorlist is not None)
+
+
+def _log_repo_problem(
+    id: typing.Optional[str],
+    name: typing.Optional[str],
+    url: typing.Optional[str],
+    metalink: typing.Optional[str],
+    mirrorlist: typing.Optional[str]
+) -> None:
     if name is None:
         log.warn("Repository info for '[{id}]' has no a name".format(id=id))
-        return False
-
-    if url is None and metalink is None and mirrorlist is None:
+    elif url is None and metalink is None and mirrorlist is None:
         log.warn("Repository info for '{id}' has no baseurl and metalink".format(id=id))
-        return False
-
-    return True
 
 
 def adopt_repositories(repofile: str, ignore: typing.Optional[typing.List[str]] = None, keep_id: bool = False) -> None:
@@ -182,13 +186,16 @@ def adopt_repositories(repofile: str, ignore: typing.Optional[typing.List[str]]
 
     log.debug(f"Adopt repofile '{repofile}'")
 
-    if not os.path.exists(repofile):
+    try:
+        repositories = list(rpm.extract_repodata(repofile))
+    except FileNotFoundError:
         log.warn("The repository adapter has tried to open an unexistent file: {filename}".format(filename=repofile))
         return
 
     with open(repofile + ".next", "a") as dst:
-        for id, name, url, metalink, mirrorlist, additional_lines in rpm.extract_repodata(repofile):
+        for id, name, url, metalink, mirrorlist, additional_lines in repositories:
             if not is_repo_ok(id, name, url, metalink, mirrorlist):
+                _log_repo_problem(id, name, url, metalink, mirrorlist)
                 continue
 
             if id in ignore:
@@ -213,11 +220,13 @@ def adopt_repositories(repofile: str, ignore: typing.Optional[typing.List[str]]
 
             dst.write(repo_format.format(id=id, name=name, url=url))
 
-            for line in (_do_common_replacement(add_line) for add_line in additional_lines):
+            for add_line in additional_lines:
+                # Most lines have nothing for _do_common_replacement to change, so skip calling it for them
+                line = _do_common_replacement(add_line) if "EPEL-7" in add_line or "repo_gpgcheck" in add_line else add_line
                 if line is not None:
                     dst.write(line)
 
-    shutil.move(repofile + ".next", repofile)
+    os.replace(repofile + ".next", repofile)
 
 
 def add_repositories_mapping(repofiles: typing.List[str], ignore: typing.Optional[typing.List[str]] = None,
@@ -230,12 +239,19 @@ def add_repositories_mapping(repofiles: typing.List[str], ignore: typing.Optiona
         for file in repofiles:
             log.debug("Processing repofile '{filename}' into leapp configuration".format(filename=file))
 
-            if not os.path.exists(file):
+            try:
+                repositories = list(rpm.extract_repodata(file))
+            except FileNotFoundError:
                 log.warn("The repository mapper has tried to open an unexistent file: {filename}".format(filename=file))
                 continue
 
-            for id, name, url, metalink, mirrorlist, additional_lines in rpm.extract_repodata(file):
+            # Collect the lines for the whole repofile and write them at once
+            leapp_repos_lines: typing.List[str] = []
+            map_lines: typing.List[str] = []
+
+            for id, name, url, metalink, mirrorlist, additional_lines in repositories:
                 if not is_repo_ok(id, name, url, metalink, mirrorlist):
+                    _log_repo_problem(id, name, url, metalink, mirrorlist)
                     continue
 
                 if id is None:
@@ -267,25 +283,30 @@ def add_repositories_mapping(repofiles: typing.List[str], ignore: typing.Optiona
                     log.warn(f"Skip repository '{id}' since it has no baseurl, metalink and mirrorlist")
                     continue
 
-                leapp_repos_file.write(repo_format.format(id=new_id, name=name, url=url))
+                leapp_repos_lines.append(repo_format.format(id=new_id, name=name, url=url))
 
-                for line in (_do_common_replacement(add_line) for add_line in additional_lines):
+                for add_line in additional_lines:
+                    line = _do_common_replacement(add_line) if "EPEL-7" in add_line or "repo_gpgcheck" in add_line else add_line
                     if line is not None:
-                        leapp_repos_file.write(line)
+                        leapp_repos_lines.append(line)
 
                 # Special case for plesk repository. We need to add dist repository to install some of plesk packages
                 # We support metalink for plesk repository, regardless of the fact we don't use them now
                 if id.startswith("PLESK_18_0") and "extras" in id and url is not None:
-                    leapp_repos_file.write(repo_format.format(id=new_id.replace("-extras", ""),
-                                                              name=name.replace("extras", ""),
-                                                              url=url.replace("extras", "dist")))
-                    leapp_repos_file.write("enabled=1\ngpgcheck=1\n")
+                    new_dist_id = new_id.replace("-extras", "")
+                    leapp_repos_lines.append(repo_format.format(id=new_dist_id,
+                                                                name=name.replace("extras", ""),
+                                                                url=url.replace("extras", "dist")))
+                    leapp_repos_lines.append("enabled=1\ngpgcheck=1\n")
+
+                    map_lines.append("{oldrepo},{newrepo},{newrepo},all,all,x86_64,rpm,ga,ga\n".format(oldrepo=id, newrepo=new_dist_id))
 
-                    map_file.write("{oldrepo},{newrepo},{newrepo},all,all,x86_64,rpm,ga,ga\n".format(oldrepo=id, newrepo=new_id.replace("-extras", "")))
+                leapp_repos_lines.append("\n")
 
-                leapp_repos_file.write("\n")
+                map_lines.append("{oldrepo},{newrepo},{newrepo},all,all,x86_64,rpm,ga,ga\n".format(oldrepo=id, newrepo=new_id))
 
-                map_file.write("{oldrepo},{newrepo},{newrepo},all,all,x86_64,rpm,ga,ga\n".format(oldrepo=id, newrepo=new_id))
+            leapp_repos_file.writelines(leapp_repos_lines)
+            map_file.writelines(map_lines)
 
         map_file.write("\n")
 
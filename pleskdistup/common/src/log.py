@@ -12,18 +12,36 @@ class logger():
     streams_logger: logging.Logger = logging.getLogger("distupgrade_streams")
     encoding: str = locale.getpreferredencoding()
 
+    # There is only one console, so the handler is shared between reinitializations
+    _console_handler: typing.Optional[logging.Handler] = None
+
     @staticmethod
     def _re_decode_message(message: str) -> str:
+        # Pure ASCII messages stay the same in any locale encoding, which is the most common case.
+        # str.isascii() would be cheaper, but it is not available on python 3.6
+        try:
+            message.encode("ascii")
+            return message
+        except UnicodeEncodeError:
+            pass
+
         return message.encode(logger.encoding, errors='backslashreplace').decode(logger.encoding, errors='backslashreplace')
 
     @staticmethod
     def _reset_logger(log: logging.Logger, loglevel: int = logging.INFO) -> None:
-        for handler in log.handlers:
+        # Iterate over copies, removal from the list being iterated skips elements
+        for handler in list(log.handlers):
             log.removeHandler(handler)
-        for filter in log.filters:
+        for filter in list(log.filters):
             log.removeFilter(filter)
         log.setLevel(loglevel)
 
+    @staticmethod
+    def _get_console_handler() -> logging.Handler:
+        if logger._console_handler is None:
+            logger._console_handler = logging.FileHandler('/dev/console', mode='w', delay=True)
+        return logger._console_handler
+
     @staticmethod
     def init_logger(logfiles: typing.List[str], streams: typing.List[typing.Any],
                     console: bool = False, loglevel: int = logging.INFO, encoding: typing.Optional[str] = None) -> None:
@@ -42,7 +60,7 @@ class logger():
         for logfile in logfiles:
             file_handlers.append(logging.FileHandler(logfile))
 
-        stream_handlers: typing.List[logging.Handler] = [logging.FileHandler('/dev/console', mode='w')] if console else []
+        stream_handlers: typing.List[logging.Handler] = [logger._get_console_handler()] if console else []
         for stream in streams:
             stream_handlers.append(logging.StreamHandler(stream))
         if len(stream_handlers):
@@ -58,58 +76,40 @@ class logger():
             logger.streams_logger.addHandler(handler)
 
     @staticmethod
-    def debug(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
+    def _log(level: int, msg: str, to_file: bool, to_stream: bool) -> None:
+        # Don't spend time on re-decoding messages nobody is going to write
+        to_file = to_file and logger.files_logger.isEnabledFor(level)
+        to_stream = to_stream and logger.is_streams_enabled and logger.streams_logger.isEnabledFor(level)
+        if not to_file and not to_stream:
+            return
+
         msg = logger._re_decode_message(msg)
         if to_file:
-            logger.files_logger.debug(msg)
+            logger.files_logger.log(level, msg)
 
-        if to_stream and logger.is_streams_enabled:
-            logger.streams_logger.debug(msg)
+        if to_stream:
+            logger.streams_logger.log(level, msg)
 
     @staticmethod
-    def info(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-        msg = logger._re_decode_message(msg)
-        if to_file:
-            logger.files_logger.info(msg)
+    def debug(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
+        logger._log(logging.DEBUG, msg, to_file, to_stream)
 
-        if to_stream and logger.is_streams_enabled:
-            logger.streams_logger.info(msg)
+    @staticmethod
+    def info(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
+        logger._log(logging.INFO, msg, to_file, to_stream)
 
     @staticmethod
     def warn(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-        msg = logger._re_decode_message(msg)
-        if to_file:
-            logger.files_logger.warn(msg)
-
-        if to_stream and logger.is_streams_enabled:
-            logger.streams_logger.warn(msg)
+        logger._log(logging.WARNING, msg, to_file, to_stream)
 
     @staticmethod
     def err(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-        msg = logger._re_decode_message(msg)
-        if to_file:
-            logger.files_logger.error(msg)
-
-        if to_stream and logger.is_streams_enabled:
-            logger.streams_logger.error(msg)
-
-
-def init_logger(logfiles: typing.List[str], streams: typing.List[typing.Any],
-                console: bool = False, loglevel: int = logging.INFO, encoding: typing.Optional[str] = None) -> None:
-    logger.init_logger(logfiles, streams, console, loglevel, encoding=encoding)
-
-
-def debug(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-    logger.debug(msg, to_file, to_stream)
-
-
-def info(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-    logger.info(msg, to_file, to_stream)
-
-
-def warn(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-    logger.warn(msg, to_file, to_stream)
+        logger._log(logging.ERROR, msg, to_file, to_stream)
 
 
-def err(msg: str, to_file: bool = True, to_stream: bool = True) -> None:
-    logger.err(msg, to_file, to_stream)
+# Module level shortcuts are bound directly to the logger methods to avoid an extra call on each log record
+init_logger = logger.init_logger
+debug = logger.debug
+info = logger.info
+warn = logger.warn
+err = logger.err
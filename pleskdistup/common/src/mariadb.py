@@ -1,6 +1,9 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import os
+import shutil
 import subprocess
 import typing
+from functools import lru_cache
 
 from . import dist, log
 import re
@@ -10,14 +13,28 @@ def is_version_larger(left: str, right: str) -> bool:
     return MariaDBVersion(left) > MariaDBVersion(right)
 
 
+@lru_cache(maxsize=1)
 def _get_mariadb_utilname() -> typing.Optional[str]:
     for utility in ("mariadb", "mysql"):
-        if subprocess.run(["which", utility], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+        if shutil.which(utility) is not None:
             return utility
 
     return None
 
 
+@lru_cache(maxsize=None)
+def _get_utility_version_output(utility: str, utility_mtime: int) -> str:
+    return subprocess.check_output([utility, "--version"], universal_newlines=True)
+
+
+def _get_version_output(utility: str) -> str:
+    # The utility binary is replaced when the package is upgraded, so its modification time
+    # shows whether the output we got before is still actual
+    utility_path = shutil.which(utility)
+    utility_mtime = os.stat(utility_path).st_mtime_ns if utility_path is not None else 0
+    return _get_utility_version_output(utility, utility_mtime)
+
+
 def is_mariadb_installed() -> bool:
     utility = _get_mariadb_utilname()
     if utility is None:
@@ -25,7 +42,7 @@ def is_mariadb_installed() -> bool:
     elif utility == "mariadb":
         return True
 
-    return "MariaDB" in subprocess.check_output([utility, "--version"], universal_newlines=True)
+    return "MariaDB" in _get_version_output(utility)
 
 
 def is_mysql_installed() -> bool:
@@ -33,7 +50,12 @@ def is_mysql_installed() -> bool:
     if utility is None or utility == "mariadb":
         return False
 
-    return "MariaDB" not in subprocess.check_output([utility, "--version"], universal_newlines=True)
+    return "MariaDB" not in _get_version_output(utility)
+
+
+_VERSION_STR_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)")
+_MYSQL_UTIL_VERSION_RE = re.compile(r"Distrib\s+(\d+)\.(\d+)\.(\d+)")
+_MARIADB_UTIL_VERSION_RE = re.compile(r"mariadb from (\d+)\.(\d+)\.(\d+)-MariaDB")
 
 
 class MariaDBVersion():
@@ -43,29 +65,23 @@ class MariaDBVersion():
     minor: int
     patch: int
 
+    def _extract_by_regexp(self, regexp: typing.Pattern[str], to_extract: str) -> None:
+        match = regexp.search(to_extract)
+        if not match:
+            raise ValueError(f"Cannot extract mariadb version from '{to_extract}'")
+        self.major, self.minor, self.patch = map(int, match.groups())
+
     def _extract_from_version_str(self, version: str):
         # Version string example is "8.2.24"
-        major_part, minor_part, patch_part = version.split(".")[:3]
-        self.major = int(major_part)
-        self.minor = int(minor_part)
-        self.patch = int(patch_part)
+        self._extract_by_regexp(_VERSION_STR_RE, version)
 
     def _extract_from_mysql_util(self, util_output: str):
         # String example: "mysql  Ver 15.1 Distrib 10.6.12-MariaDB, for debian-linux-gnu (x86_64) using  EditLine wrapper"
-        major_part, minor_part, patch_part = util_output.split("Distrib ")[1].split(",")[0].split("-")[0].split(".")[:3]
-        self.major = int(major_part)
-        self.minor = int(minor_part)
-        self.patch = int(patch_part)
+        self._extract_by_regexp(_MYSQL_UTIL_VERSION_RE, util_output)
 
     def _extract_from_mariadb_util(self, util_output: str):
         # String example: "mariadb from 11.6.2-MariaDB, client 15.2 for Linux (x86_64) using  EditLine wrapper"
-        match = re.search(r"mariadb from (\d+)\.(\d+)\.(\d+)-MariaDB", util_output)
-        if not match:
-            raise ValueError(f"Cannot extract mariadb version from '{util_output}'")
-        major_part, minor_part, patch_part = match.groups()
-        self.major = int(major_part)
-        self.minor = int(minor_part)
-        self.patch = int(patch_part)
+        self._extract_by_regexp(_MARIADB_UTIL_VERSION_RE, util_output)
 
     def __init__(self, to_extract: str):
         """Initialize a version object."""
@@ -82,26 +98,31 @@ class MariaDBVersion():
         else:
             raise ValueError(f"Cannot extract mariadb version from '{to_extract}'")
 
+    def _to_tuple(self) -> typing.Tuple[int, int, int]:
+        return (self.major, self.minor, self.patch)
+
     def __str__(self):
         """Return a string representation of a PHPVersion object."""
         return f"{self.major}.{self.minor}.{self.patch}"
 
     def __lt__(self, other):
-        return self.major < other.major or (self.major == other.major and self.minor < other.minor) or (self.major == other.major and self.minor == other.minor and self.patch < other.patch)
+        return self._to_tuple() < other._to_tuple()
 
     def __eq__(self, other):
-        return self.major == other.major and self.minor == other.minor and self.patch == other.patch
+        return self._to_tuple() == other._to_tuple()
 
     def __ge__(self, other):
         return not self.__lt__(other)
 
+    def __hash__(self) -> int:
+        return hash(self._to_tuple())
+
 
 def get_installed_mariadb_version() -> MariaDBVersion:
     utility = _get_mariadb_utilname()
     if not utility:
         raise RuntimeError("Unable to find mariadb or mysql utility")
-    out = subprocess.check_output([utility, "--version"], universal_newlines=True)
-    result = MariaDBVersion(out)
+    result = MariaDBVersion(_get_version_output(utility))
     log.debug(f"Detected mariadb version is: {result}")
     return result
 
@@ -13,12 +13,11 @@ def restore_ssh_login_message(motd_path: str = MOTD_PATH) -> None:
 
 def add_inprogress_ssh_login_message(message: str, motd_path: str = MOTD_PATH) -> None:
     try:
-        if not files.backup_exists(motd_path):
-            if os.path.exists(motd_path):
-                files.backup_file(motd_path)
-            else:
-                with open(motd_path + files.DEFAULT_BACKUP_EXTENSION, "a") as motd:
-                    pass
+        # backup_file checks the motd file exists by itself, so there is no need to do it here too
+        if not files.backup_exists(motd_path) and not files.backup_file(motd_path):
+            # The empty backup means there was no motd file before
+            with open(motd_path + files.DEFAULT_BACKUP_EXTENSION, "a") as motd:
+                pass
 
         with open(motd_path, "a") as motd:
             motd.write(message)
@@ -38,14 +37,14 @@ FINISH_END_MESSAGE = """You can remove this message from the {} file.
 
 def add_finish_ssh_login_message(message: str, motd_path: str = MOTD_PATH) -> None:
     try:
-        if not os.path.exists(motd_path + ".next"):
+        next_path = motd_path + ".next"
+        if not os.path.exists(next_path):
             if os.path.exists(motd_path + files.DEFAULT_BACKUP_EXTENSION):
-                shutil.copy(motd_path + files.DEFAULT_BACKUP_EXTENSION, motd_path + ".next")
+                shutil.copy(motd_path + files.DEFAULT_BACKUP_EXTENSION, next_path)
 
-            with open(motd_path + ".next", "a") as motd:
-                motd.write(FINISH_INTRODUCE_MESSAGE)
+            message = FINISH_INTRODUCE_MESSAGE + message
 
-        with open(motd_path + ".next", "a") as motd:
+        with open(next_path, "a") as motd:
             motd.write(message)
     except FileNotFoundError:
         log.warn("The /etc/motd file cannot be changed or created. The utility may be lacking the permissions to do so.")
@@ -57,7 +56,7 @@ def publish_finish_ssh_login_message(motd_path: str = MOTD_PATH) -> None:
             with open(motd_path + ".next", "a") as motd:
                 motd.write(FINISH_END_MESSAGE)
 
-            shutil.move(motd_path + ".next", motd_path)
+            os.replace(motd_path + ".next", motd_path)
         else:
             files.restore_file_from_backup(motd_path, remove_if_no_backup=True)
     except FileNotFoundError:
@@ -3,6 +3,36 @@ import os
 import typing
 
 
+class FstabEntry(typing.NamedTuple):
+    line_number: int
+    device: str
+    mount_point: str
+    line: str
+
+
+def read_fstab_entries(configpath: str) -> typing.Iterator[FstabEntry]:
+    """
+    Lazily reads entries of the fstab configuration file, skipping comments and blank lines.
+    All fstab checks are expected to be built on top of this generator, so the file is parsed the same way.
+    Args:
+        configpath (str): The path to the fstab configuration file.
+    Yields:
+        FstabEntry: The entry with its line number, device, mount point and the stripped line itself.
+    """
+    with open(configpath, "r") as f:
+        for line_number, line in enumerate(f):
+            stripped = line.strip()
+            if not stripped or stripped[0] == "#":
+                continue
+            # Only the first two fields are interesting, so don't split the rest of the line
+            fields = stripped.split(None, 2)
+            yield FstabEntry(line_number, fields[0], fields[1] if len(fields) > 1 else "", stripped)
+
+
+def _read_mount_points_order(configpath: str) -> typing.Dict[str, int]:
+    return {entry.mount_point: entry.line_number for entry in read_fstab_entries(configpath)}
+
+
 def get_fstab_configuration_misorderings(configpath: str) -> typing.List[typing.Tuple[str, str]]:
     """
     Analyzes the fstab configuration file to find misorderings in mount points.
@@ -22,27 +52,32 @@ def get_fstab_configuration_misorderings(configpath: str) -> typing.List[typing.
     if not os.path.exists(configpath):
         return []
 
-    mount_points_order: typing.Dict[str, int] = {}
-    with open(configpath, "r") as f:
-        for iter, line in enumerate(f.readlines()):
-            if line.startswith("#") or line == "\n" or line == "":
-                continue
-            mount_point = line.split()[1]
-            mount_points_order[mount_point] = iter
+    mount_points_order = _read_mount_points_order(configpath)
+
+    # Sorting by path components places every mount point right after its ancestors,
+    # so a stack of the current ancestors is enough to find all parent-child pairs in one pass.
+    # Plain string sorting would not work since e.g. "/home-old" goes between "/home" and "/home/test".
+    absolute_mount_points = sorted(
+        (mount_point for mount_point in mount_points_order.keys() if mount_point.startswith("/")),
+        key=lambda mount_point: mount_point.split("/"),
+    )
 
-    misorderings: typing.List[typing.Tuple[str, str]] = []
-    for mount_point in mount_points_order.keys():
-        if mount_point == "/" or not mount_point.startswith("/"):
-            continue
+    found: typing.List[typing.Tuple[int, int, str, str]] = []
+    # Ancestors are stored with the prefix their descendants start with, so it is built once per mount point
+    ancestors: typing.List[typing.Tuple[str, str]] = []
+    for mount_point in absolute_mount_points:
+        while ancestors and not mount_point.startswith(ancestors[-1][1]):
+            ancestors.pop()
 
-        parent_dir: str = mount_point
-        root_found: bool = False
+        if mount_point != "/":
+            order = mount_points_order[mount_point]
+            # Nearest parents go first, like if we were walking up to the root
+            for depth, (parent_dir, _) in enumerate(reversed(ancestors)):
+                if mount_points_order[parent_dir] > order:
+                    found.append((order, depth, parent_dir, mount_point))
 
-        while not root_found:
-            parent_dir = os.path.dirname(parent_dir)
-            if parent_dir in mount_points_order and mount_points_order[parent_dir] > mount_points_order[mount_point]:
-                misorderings.append((parent_dir, mount_point))
-            if parent_dir == "/":
-                root_found = True
+        ancestors.append((mount_point, mount_point.rstrip("/") + "/"))
 
-    return misorderings
+    # Report misorderings in the order mount points appear in the file
+    found.sort(key=lambda item: (item[0], item[1]))
+    return [(parent_dir, mount_point) for _, _, parent_dir, mount_point in found]
@@ -1,88 +1,54 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import types
 import typing
+from functools import lru_cache
 
 from . import dist, dpkg, rpm
 
 
-def filter_installed_packages(lookup_pkgs: typing.Iterable[str]) -> typing.List[str]:
-    return [pkg for pkg in lookup_pkgs if is_package_installed(pkg)]
-
-
-def is_package_installed(pkg: str) -> bool:
+@lru_cache(maxsize=1)
+def _get_backend() -> types.ModuleType:
+    # The distro doesn't change during the run, so choose the package backend only once
     started_on = dist.get_distro()
     if started_on.deb_based:
-        return dpkg.is_package_installed(pkg)
+        return dpkg
     elif started_on.rhel_based:
-        return rpm.is_package_installed(pkg)
+        return rpm
     else:
         raise NotImplementedError(f"Unsupported distro {started_on}")
 
 
+def filter_installed_packages(lookup_pkgs: typing.Iterable[str]) -> typing.List[str]:
+    return _get_backend().filter_installed_packages(lookup_pkgs)
+
+
+def is_package_installed(pkg: str) -> bool:
+    return _get_backend().is_package_installed(pkg)
+
+
 def install_packages(pkgs: typing.List[str], repository: typing.Optional[str] = None, force_package_config: bool = False) -> None:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        dpkg.install_packages(pkgs, repository, force_package_config)
-    elif started_on.rhel_based:
-        rpm.install_packages(pkgs, repository, force_package_config)
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    _get_backend().install_packages(pkgs, repository, force_package_config)
 
 
 def remove_packages(pkgs: typing.List[str]) -> None:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        dpkg.remove_packages(pkgs)
-    elif started_on.rhel_based:
-        rpm.remove_packages(pkgs)
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    _get_backend().remove_packages(pkgs)
 
 
 def find_related_repofiles(repofiles_mask: str) -> typing.List[str]:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        return dpkg.find_related_repofiles(repofiles_mask)
-    elif started_on.rhel_based:
-        return rpm.find_related_repofiles(repofiles_mask)
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    return _get_backend().find_related_repofiles(repofiles_mask)
 
 
 def update_package_list() -> None:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        return dpkg.update_package_list()
-    elif started_on.rhel_based:
-        return rpm.update_package_list()
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    return _get_backend().update_package_list()
 
 
 def upgrade_packages(pkgs: typing.Optional[typing.List[str]] = None) -> None:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        return dpkg.upgrade_packages(pkgs)
-    elif started_on.rhel_based:
-        return rpm.upgrade_packages(pkgs)
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    return _get_backend().upgrade_packages(pkgs)
 
 
 def autoremove_outdated_packages() -> None:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        return dpkg.autoremove_outdated_packages()
-    elif started_on.rhel_based:
-        return rpm.autoremove_outdated_packages()
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    return _get_backend().autoremove_outdated_packages()
 
 
 def get_installed_packages_list(regex: str) -> typing.List[typing.Tuple[str, str]]:
-    started_on = dist.get_distro()
-    if started_on.deb_based:
-        return dpkg.get_installed_packages_list(regex)
-    elif started_on.rhel_based:
-        return rpm.get_installed_packages_list(regex)
-    else:
-        raise NotImplementedError(f"Unsupported distro {started_on}")
+    return _get_backend().get_installed_packages_list(regex)
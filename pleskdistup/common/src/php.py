@@ -1,31 +1,40 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 import typing
+from functools import lru_cache
 
 from . import version
 
+# TODO: get rid of the explicit version list
+_KNOWN_PHP_VERSIONS = (
+    "5.2", "5.3", "5.4", "5.5", "5.6",
+    "7.0", "7.1", "7.2", "7.3", "7.4",
+    "8.0", "8.1", "8.2", "8.3",
+)
+
+_PHP_HANDLER_TEMPLATES = ("{}-cgi", "{}-fastcgi", "{}-fpm", "{}-fpm-dedicated")
+
 
 def get_known_php_versions() -> typing.List[version.PHPVersion]:
-    # TODO: get rid of the explicit version list
-    return [
-        version.PHPVersion(ver) for ver in (
-            "5.2", "5.3", "5.4", "5.5", "5.6",
-            "7.0", "7.1", "7.2", "7.3", "7.4",
-            "8.0", "8.1", "8.2", "8.3",
-        )
-    ]
+    return [version.PHPVersion(ver) for ver in _KNOWN_PHP_VERSIONS]
 
 
 def get_php_handlers(php_versions: typing.List[version.PHPVersion]) -> typing.List[str]:
-    php_handlers = {"{}-cgi", "{}-fastcgi", "{}-fpm", "{}-fpm-dedicated"}
-    return [handler.format(f"plesk-php{php.major}{php.minor}") for php in php_versions for handler in php_handlers]
+    return [handler.format(f"plesk-php{php.major}{php.minor}") for php in php_versions for handler in _PHP_HANDLER_TEMPLATES]
+
+
+@lru_cache(maxsize=None)
+def _get_outdated_php_handlers(first_modern_major: int, first_modern_minor: int) -> typing.Tuple[str, ...]:
+    first_modern = version.PHPVersion(f"{first_modern_major}.{first_modern_minor}")
+    return tuple(get_php_handlers([php for php in get_known_php_versions() if php < first_modern]))
 
 
 def get_outdated_php_handlers(first_modern: version.PHPVersion) -> typing.List[str]:
-    return get_php_handlers([php for php in get_known_php_versions() if php < first_modern])
+    # PHPVersion objects are mutable, so the cache is keyed by the version numbers
+    return list(_get_outdated_php_handlers(first_modern.major, first_modern.minor))
 
 
 def get_php_handlers_by_condition(condition: typing.Callable[[version.PHPVersion], bool]) -> typing.List[str]:
-    return get_php_handlers([php for php in get_known_php_versions() if condition(php)])
+    return get_php_handlers(get_php_versions_by_condition(condition))
 
 
 def get_php_versions_by_condition(condition: typing.Callable[[version.PHPVersion], bool]) -> typing.List[version.PHPVersion]:
@@ -1,15 +1,19 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 
 import enum
+import io
 import os
 import re
 import subprocess
+import tempfile
 import typing
-import urllib.request
-import xml.etree.ElementTree as ElementTree
+from functools import lru_cache
 
 from . import dist, log, mariadb, systemd, version, util
 
+if typing.TYPE_CHECKING:
+    import xml.etree.ElementTree as ElementTree
+
 # http://autoinstall.plesk.com/products.inf3 is an xml file with available products,
 # including all versions of Plesk.
 DEFAULT_AUTOINSTALL_PRODUCTS_FILE = "http://autoinstall.plesk.com/products.inf3"
@@ -30,31 +34,79 @@ def send_error_report(error_message: str) -> None:
         log.debug(f"Sending error report failed: {ex}")
 
 
+@lru_cache(maxsize=1)
+def _get_plesk_version_output() -> typing.Tuple[str, ...]:
+    # "plesk version" is slow and its output doesn't change during the run, so call it only once
+    return tuple(subprocess.check_output(["/usr/sbin/plesk", "version"], universal_newlines=True).splitlines())
+
+
 def get_plesk_version() -> version.PleskVersion:
-    version_info = subprocess.check_output(["/usr/sbin/plesk", "version"], universal_newlines=True).splitlines()
-    for line in version_info:
+    # A new object is created on every call, because callers are allowed to modify it
+    for line in _get_plesk_version_output():
         if line.startswith("Product version"):
             return version.PleskVersion(line.split()[-1])
 
     raise Exception("Unable to parse plesk version output.")
 
 
+PLESK_VERSION_FILE = "/usr/local/psa/version"
+
+
+@lru_cache(maxsize=1)
+def _read_plesk_version_file() -> typing.Optional[str]:
+    # The file looks like "18.0.60 CentOS 7 1800240405.10"
+    try:
+        with open(PLESK_VERSION_FILE, "r") as version_file:
+            fields = version_file.readline().split()
+    except OSError:
+        return None
+    return fields[0] if fields else None
+
+
+def get_plesk_version_fast() -> version.PleskVersion:
+    """Get the installed Plesk version without the hotfix part.
+
+    The version file is read instead of calling "plesk version", which is much slower.
+    The file doesn't contain the hotfix, so the hotfix is always 0, even when
+    we have to fall back to "plesk version".
+    """
+    result = None
+    version_str = _read_plesk_version_file()
+    if version_str is not None:
+        try:
+            result = version.PleskVersion(version_str)
+        except ValueError as ex:
+            log.debug(f"Unable to parse Plesk version from {PLESK_VERSION_FILE!r}: {ex}")
+
+    if result is None:
+        result = get_plesk_version()
+    result.hotfix = 0
+    return result
+
+
 def extract_plesk_versions(products_xml: str) -> typing.List[version.PleskVersion]:
     if not products_xml:
         return []
 
+    # Importing xml is noticeable on startup, while the products list is not needed on most runs
+    import xml.etree.ElementTree as ElementTree
+
     versions = []
-    root = ElementTree.fromstring(products_xml)
-    for product in root.findall('.//product[@id="plesk"]'):
-        release_key = product.get('release-key')
-        if release_key and '-' in release_key:
-            versions.append(version.PleskVersion(release_key.split("-", 1)[1]))
+    # The products list is quite big, so don't keep the whole tree in memory
+    for _, elem in ElementTree.iterparse(io.StringIO(products_xml), events=("end",)):
+        if elem.tag == "product" and elem.get("id") == "plesk":
+            release_key = elem.get('release-key')
+            if release_key and '-' in release_key:
+                versions.append(version.PleskVersion(release_key.split("-", 1)[1]))
+        elem.clear()
     return versions
 
 
 def get_available_plesk_versions(
     autoinstall_products_file_url: str = DEFAULT_AUTOINSTALL_PRODUCTS_FILE
 ) -> typing.List[version.PleskVersion]:
+    import urllib.request
+
     try:
         with urllib.request.urlopen(autoinstall_products_file_url) as response:
             products_config = response.read().decode('utf-8')
@@ -66,7 +118,7 @@ def get_available_plesk_versions(
 
 
 def get_plesk_full_version() -> typing.List[str]:
-    return subprocess.check_output(["/usr/sbin/plesk", "version"], universal_newlines=True).splitlines()
+    return list(_get_plesk_version_output())
 
 
 def prepare_conversion_flag(status_flag_path: str) -> None:
@@ -74,12 +126,20 @@ def prepare_conversion_flag(status_flag_path: str) -> None:
         pass
 
 
+RESULTS_SENDER_PATHS = ("/var/cache/parallels_installer/report-update", "/root/parallels/report-update")
+_results_sender_path: typing.Optional[str] = None
+
+
+def _find_results_sender() -> typing.Optional[str]:
+    # The utility is not removed during the conversion, so remember where we found it
+    global _results_sender_path
+    if _results_sender_path is None:
+        _results_sender_path = next((path for path in RESULTS_SENDER_PATHS if os.path.exists(path)), None)
+    return _results_sender_path
+
+
 def send_conversion_status(succeed: bool, status_flag_path: str) -> None:
-    results_sender_path = None
-    for path in ["/var/cache/parallels_installer/report-update", "/root/parallels/report-update"]:
-        if os.path.exists(path):
-            results_sender_path = path
-            break
+    results_sender_path = _find_results_sender()
 
     # For now we are not going to install sender in scope of conversion.
     # So if we have one, use it. If not, just skip send the results
@@ -109,8 +169,10 @@ def send_conversion_status(succeed: bool, status_flag_path: str) -> None:
 
 
 def remove_conversion_flag(status_flag_path: str) -> None:
-    if os.path.exists(status_flag_path):
+    try:
         os.unlink(status_flag_path)
+    except FileNotFoundError:
+        pass
 
 
 def list_installed_extensions() -> typing.List[typing.Tuple[str, str]]:
@@ -174,6 +236,9 @@ class PleskComponent:
         return self.state in (PleskComponentState.UPGRADE, PleskComponentState.UP2DATE)
 
 
+_COMPONENT_LINE_RE = re.compile(r"\s*(?P<name>\S+)\s*\[(?P<state>[^]]+)\]\s*-\s*(?P<desc>.*)")
+
+
 def list_installed_components() -> typing.Dict[str, PleskComponent]:
     """List installed Plesk components.
 
@@ -182,28 +247,31 @@ def list_installed_components() -> typing.Dict[str, PleskComponent]:
     """
     cmd = ["/usr/sbin/plesk", "installer", "--select-release-current", "--show-components"]
     log.debug(f"Listing installed Plesk components by {cmd}")
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=True,
-        universal_newlines=True,
-    )
-    log.debug(f"Command {cmd} returned {proc.returncode}, stdout: '{proc.stdout}', stderr: '{proc.stderr}'")
-    comp_info = proc.stdout.splitlines()
     res: typing.Dict[str, PleskComponent] = {}
-    comp_re = re.compile(r"\s*(?P<name>\S+)\s*\[(?P<state>[^]]+)\]\s*-\s*(?P<desc>.*)")
-    for line in comp_info:
-        log.debug(f"Parsing line {line!r} of components listing")
-        m = comp_re.match(line)
-        if m:
-            c = PleskComponent(
-                name=m["name"],
-                state=PleskComponentState(m["state"]),
-                description=m["desc"],
-            )
-            log.debug(f"Discovered component {c}")
-            res[c.name] = c
+    stdout: typing.List[str] = []
+    # Parse the components while the installer is still printing them. Stderr goes to a temporary file,
+    # so the installer can't get stuck on a full pipe we don't read yet.
+    with tempfile.TemporaryFile(mode="w+") as stderr_file:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, universal_newlines=True) as proc:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                stdout.append(line)
+                m = _COMPONENT_LINE_RE.match(line)
+                if m is None:
+                    continue
+                c = PleskComponent(
+                    name=m["name"],
+                    state=PleskComponentState(m["state"]),
+                    description=m["desc"],
+                )
+                log.debug(f"Discovered component {c}")
+                res[c.name] = c
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+
+    log.debug(f"Command {cmd} returned {proc.returncode}, stdout: '{''.join(stdout)}', stderr: '{stderr}'")
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output="".join(stdout), stderr=stderr)
     return res
 
 
@@ -239,7 +307,9 @@ def get_from_plesk_database(query: str) -> typing.Optional[typing.List[str]]:
     return proc.stdout.splitlines()
 
 
-def get_repository_by_os_from_inf3(inf3_content: typing.Union[ElementTree.Element, str], os: dist.Distro) -> typing.Optional[str]:
+def get_repository_by_os_from_inf3(inf3_content: typing.Union["ElementTree.Element", str], os: dist.Distro) -> typing.Optional[str]:
+    import xml.etree.ElementTree as ElementTree
+
     if isinstance(inf3_content, str):
         if not inf3_content:
             return None
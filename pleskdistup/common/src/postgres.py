@@ -1,6 +1,7 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 import os
 import subprocess
+from functools import lru_cache
 
 _PATH_TO_PSQL_UTIL = '/usr/bin/psql'
 
@@ -9,11 +10,19 @@ def is_postgres_installed() -> bool:
     return os.path.exists(get_pgsql_root_path()) and os.path.exists(_PATH_TO_PSQL_UTIL)
 
 
-def get_postgres_major_version() -> int:
+@lru_cache(maxsize=4)
+def _get_psql_major_version(psql_mtime: int) -> int:
     version_out = subprocess.check_output([_PATH_TO_PSQL_UTIL, '--version'], universal_newlines=True)
     return int(version_out.split(' ')[2].split('.')[0])
 
 
+def get_postgres_major_version() -> int:
+    # The version of the installed binaries could differ from the version of the database
+    # (the data directory), so we still ask psql. Its modification time shows whether
+    # the package was upgraded since the last call.
+    return _get_psql_major_version(os.stat(_PATH_TO_PSQL_UTIL).st_mtime_ns)
+
+
 def get_pgsql_root_path() -> str:
     return '/var/lib/pgsql'
 
@@ -30,14 +39,15 @@ def is_database_initialized() -> bool:
     return os.path.exists(os.path.join(get_data_path(), "PG_VERSION"))
 
 
-def is_database_major_version_lower(version: int) -> bool:
+def get_database_major_version() -> int:
     version_file_path = os.path.join(get_data_path(), "PG_VERSION")
 
     if not os.path.exists(version_file_path):
         raise Exception('There is no "' + version_file_path + '" file')
 
     with open(version_file_path, 'r') as version_file:
-        pg_version = int(version_file.readline().split('.')[0])
-        if pg_version < version:
-            return True
-    return False
+        return int(version_file.readline().split('.')[0])
+
+
+def is_database_major_version_lower(version: int) -> bool:
+    return get_database_major_version() < version
@@ -1,15 +1,25 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import collections
+import io
 import ipaddress
-import itertools
 import os
-import shutil
+import re
 import subprocess
+import sys
 import typing
+from functools import lru_cache
 
 from urllib.parse import urlparse
 
 from . import files, util, log
 
+RPMNEW_SUFFIX = ".rpmnew"
+RPMSAVE_SUFFIX = ".rpmsave"
+
+_RPM_NOT_INSTALLED_RE = re.compile(r"^package (?P<name>.+) is not installed$")
+# Matches links whose host part looks like an IPv4 address or a bracketed IPv6 address
+_IP_HOST_LIKE_RE = re.compile(r"//(?:[^/@]*@)?(?:\d{1,3}(?:\.\d{1,3}){3}|\[[0-9a-fA-F:.]+\])(?:[/:?#]|$)")
+
 REPO_HEAD_WITH_URL = """[{id}]
 name={name}
 baseurl={url}
@@ -45,50 +55,52 @@ def extract_repodata(
     mirrorlist: typing.Optional[str] = None
     additional: typing.List[str] = []
 
-    if not os.path.exists(repofile):
+    try:
+        # Repository files are small, so read each one by a single call
+        with open(repofile, "r") as repo:
+            content = repo.read()
+    except FileNotFoundError:
         raise FileNotFoundError(f"The repository file {repofile!r} does not exist")
 
-    with open(repofile, "r") as repo:
-        for line in repo.readlines():
-            if line.startswith("["):
-                if id is not None:
-                    yield (id, name, url, metalink, mirrorlist, additional)
-
-                id = None
-                name = None
-                url = None
-                metalink = None
-                mirrorlist = None
-                additional = []
-
-            log.debug("Repository file line: {line}".format(line=line.rstrip()))
-            if line.startswith("["):
-                id = line[1:-2]
-                continue
+    # str.splitlines() would also break lines on form feeds and other separators, unlike reading a file
+    for line in io.StringIO(content):
+        if line.startswith("["):
+            if id is not None:
+                yield (id, name, url, metalink, mirrorlist, additional)
+
+            id = line[1:-2]
+            name = None
+            url = None
+            metalink = None
+            mirrorlist = None
+            additional = []
+            continue
 
-            if "=" not in line:
-                additional.append(line)
-                continue
+        # Additional lines like "enabled=1" are mostly the same for all repositories,
+        # so intern them to keep only one copy of each
+        field, sep, val = line.partition("=")
+        if not sep:
+            additional.append(sys.intern(line))
+            continue
 
-            field, val = line.split("=", 1)
-            field = field.strip().rstrip()
-            val = val.strip().rstrip()
-            if field == "name":
-                name = val
-            elif field == "baseurl":
-                url = val
-            elif field == "metalink":
-                metalink = val
-            elif field == "mirrorlist":
-                mirrorlist = val
-            else:
-                additional.append(line)
+        field = field.strip()
+        val = val.strip()
+        if field == "name":
+            name = val
+        elif field == "baseurl":
+            url = val
+        elif field == "metalink":
+            metalink = val
+        elif field == "mirrorlist":
+            mirrorlist = val
+        else:
+            additional.append(sys.intern(line))
 
     yield (id, name, url, metalink, mirrorlist, additional)
 
 
-def write_repodata(
-    repofile: str,
+def _write_repodata_to(
+    dst: typing.TextIO,
     id: typing.Optional[str],
     name: typing.Optional[str],
     url: typing.Optional[str],
@@ -104,10 +116,21 @@ def write_repodata(
         url = mirrorlist
         repo_format = REPO_HEAD_WITH_MIRRORLIST
 
+    dst.write(repo_format.format(id=id, name=name, url=url))
+    dst.writelines(additional)
+
+
+def write_repodata(
+    repofile: str,
+    id: typing.Optional[str],
+    name: typing.Optional[str],
+    url: typing.Optional[str],
+    metalink: typing.Optional[str],
+    mirrorlist: typing.Optional[str],
+    additional: typing.List[str]
+) -> None:
     with open(repofile, "a") as dst:
-        dst.write(repo_format.format(id=id, name=name, url=url))
-        for line in additional:
-            dst.write(line)
+        _write_repodata_to(dst, id, name, url, metalink, mirrorlist, additional)
 
 
 def remove_repositories(
@@ -125,24 +148,56 @@ def remove_repositories(
         ]
     ]
 ) -> None:
-    for id, name, url, metalink, mirrorlist, additional_lines in extract_repodata(repofile):
-        remove = False
-        for condition in conditions:
-            if condition(id, name, url, metalink, mirrorlist):
-                remove = True
-                break
-
-        if not remove:
-            write_repodata(repofile + ".next", id, name, url, metalink, mirrorlist, additional_lines)
-
-    if os.path.exists(repofile + ".next"):
-        shutil.move(repofile + ".next", repofile)
-    else:
-        os.remove(repofile)
+    repositories = list(extract_repodata(repofile))
+    kept_repositories = [
+        (id, name, url, metalink, mirrorlist, additional_lines)
+        for id, name, url, metalink, mirrorlist, additional_lines in repositories
+        if not any(condition(id, name, url, metalink, mirrorlist) for condition in conditions)
+    ]
 
+    # Usually nothing matches, so there is no need to rewrite the file
+    if len(kept_repositories) == len(repositories):
+        return
+
+    if not kept_repositories:
+        os.remove(repofile)
+        return
 
-def filter_installed_packages(lookup_pkgs: typing.List[str]) -> typing.List[str]:
-    return [pkg for pkg in lookup_pkgs if is_package_installed(pkg)]
+    next_path = repofile + ".next"
+    with open(next_path, "w") as dst:
+        for repository in kept_repositories:
+            _write_repodata_to(dst, *repository)
+    os.replace(next_path, repofile)
+
+
+def filter_installed_packages(lookup_pkgs: typing.Iterable[str]) -> typing.List[str]:
+    pkgs = list(lookup_pkgs)
+    if not pkgs:
+        return []
+
+    # Query all packages by one rpm call. It fails when some of the packages are not installed,
+    # but reports each of them by a separate line, so the return code is not checked.
+    res = subprocess.run(
+        ["/usr/bin/rpm", "--query", "--queryformat", "%{NAME}\n"] + pkgs,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+        env={
+            "PATH": os.environ["PATH"],
+            "LC_ALL": "C",
+            "LANG": "C",
+        },
+    )
+    not_installed = set()
+    for line in res.stdout.splitlines():
+        match = _RPM_NOT_INSTALLED_RE.match(line)
+        if match is not None:
+            not_installed.add(match.group("name"))
+
+    if res.returncode != 0 and not not_installed:
+        # Something went wrong with rpm itself, so check packages one by one to be on the safe side
+        return [pkg for pkg in pkgs if is_package_installed(pkg)]
+    return [pkg for pkg in pkgs if pkg not in not_installed]
 
 
 def is_package_installed(pkg: str) -> bool:
@@ -171,52 +226,88 @@ def install_packages(
 
 
 def get_installed_packages_list(regex: str) -> typing.List[typing.Tuple[str, str]]:
-    pkgs_info = subprocess.check_output(["/usr/bin/rpm", "-qa", "--queryformat", "%{NAME} %{VERSION}-%{RELEASE}\n", regex], universal_newlines=True)
+    cmd = ["/usr/bin/rpm", "-qa", "--queryformat", "%{NAME} %{VERSION}-%{RELEASE}\n", regex]
     result = []
-    for line in pkgs_info.splitlines():
-        name, version = line.split(" ", 1)
-        result.append((name, version))
+    # Parse the output while it is read, so the whole output isn't kept in memory next to the result
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            name, _, version = line.rstrip("\n").partition(" ")
+            result.append((name, version))
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
     return result
 
 
+def _get_package_name_from_nevra(nevra: str) -> str:
+    # The epoch could be printed before the name, like "1:name-version-release.arch"
+    return nevra.rsplit("-", 2)[0].split(":", 1)[-1]
+
+
 def remove_packages(pkgs: typing.List[str]) -> None:
     if len(pkgs) == 0:
         return
 
+    to_remove = pkgs
     if os.path.exists("/usr/bin/package-cleanup"):
         duplicates = subprocess.check_output(["/usr/bin/package-cleanup", "--dupes"], universal_newlines=True).splitlines()
-        for duplicate, pkg in itertools.product(duplicates, pkgs):
-            if pkg in duplicate:
-                util.logged_check_call(["/usr/bin/rpm", "-e", "--nodeps", duplicate])
-                # Since we removed each duplicate, we don't need to remove the package in the end.
-                if pkg in pkgs:
-                    pkgs.remove(pkg)
+        dup_map: typing.Dict[str, typing.List[str]] = collections.defaultdict(list)
+        for duplicate in duplicates:
+            duplicate = duplicate.strip()
+            if duplicate:
+                dup_map[_get_package_name_from_nevra(duplicate)].append(duplicate)
+
+        # Each duplicated package is removed by its full names, so we don't need to remove it by the name in the end.
+        to_remove = []
+        handled: typing.Set[str] = set()
+        for pkg in pkgs:
+            if pkg in handled:
+                continue
+            to_remove.extend(dup_map.get(pkg, [pkg]))
+            handled.add(pkg)
 
-    util.logged_check_call(["/usr/bin/rpm", "-e", "--nodeps"] + pkgs)
+    # Remove everything by one rpm transaction instead of calling rpm for every duplicate
+    util.logged_check_call(["/usr/bin/rpm", "-e", "--nodeps"] + to_remove)
 
 
-def handle_rpmnew(original_path: str) -> bool:
-    if not os.path.exists(original_path + ".rpmnew"):
-        return False
-
-    if os.path.exists(original_path):
+def _replace_with_rpmnew(original_path: str, original_exists: bool) -> None:
+    # The .rpmnew and .rpmsave files are neighbours of the original one, so a plain rename is enough
+    if original_exists:
         log.debug("The '{path}' file has a '.rpmnew' analogue file. Going to replace the file with this rpmnew file. "
                   "The file itself will be saved as .rpmsave".format(path=original_path))
-        shutil.move(original_path, original_path + ".rpmsave")
+        os.rename(original_path, original_path + RPMSAVE_SUFFIX)
     else:
         log.debug("The '{path}' file is missing, but has '.rpmnew' analogue file. Going to use it".format(path=original_path))
 
-    shutil.move(original_path + ".rpmnew", original_path)
+    os.rename(original_path + RPMNEW_SUFFIX, original_path)
+
 
+def handle_rpmnew(original_path: str) -> bool:
+    if not os.path.lexists(original_path + RPMNEW_SUFFIX):
+        return False
+
+    _replace_with_rpmnew(original_path, os.path.lexists(original_path))
     return True
 
 
 def handle_all_rpmnew_files(directory: str) -> typing.List[str]:
+    if not os.path.isdir(directory):
+        return []
+
+    # Plan all renames by one pass over the directory, so we don't need to check each file separately
+    with os.scandir(directory) as entries:
+        names = [entry.name for entry in entries]
+    existing_names = set(names)
+
     fixed_list = []
-    for file in files.find_files_case_insensitive(directory, ["*.rpmnew"]):
-        original_file = file[:-len(".rpmnew")]
-        if handle_rpmnew(original_file):
-            fixed_list.append(original_file)
+    for name in names:
+        if not name.endswith(RPMNEW_SUFFIX):
+            continue
+
+        original_name = name[:-len(RPMNEW_SUFFIX)]
+        original_path = os.path.join(directory, original_name)
+        _replace_with_rpmnew(original_path, original_name in existing_names)
+        fixed_list.append(original_path)
 
     return fixed_list
 
@@ -247,13 +338,11 @@ def repository_has_none_link(
     metalink: typing.Optional[str],
     mirrorlist: typing.Optional[str]
 ) -> bool:
-    for link in (url, metalink, mirrorlist):
-        if link is not None and link.lower() == "none":
-            return True
-
-    return False
+    # Check the length first, so real links are rejected without making a lowercase copy of them
+    return any(link is not None and len(link) == 4 and link.lower() == "none" for link in (url, metalink, mirrorlist))
 
 
+@lru_cache(maxsize=256)
 def repository_source_is_ip(
     baseurl: typing.Optional[str],
     metalink: typing.Optional[str],
@@ -271,7 +360,8 @@ def repository_source_is_ip(
     - bool: True if any of the URLs is an IP address, False otherwise.
     """
     for link in (baseurl, metalink, mirrorlist):
-        if link is None:
+        # Skip usual domain names without parsing the link and trying to parse the host as an address
+        if link is None or not _IP_HOST_LIKE_RE.search(link):
             continue
 
         hostname = urlparse(link).hostname
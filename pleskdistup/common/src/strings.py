@@ -17,6 +17,8 @@ def create_replace_string_function(old: str, new: str) -> typing.Callable[[str],
 
 
 def create_replace_regexp_function(pattern: str, repl: str) -> typing.Callable[[str], str]:
+    compiled = re.compile(pattern)
+
     def inner(line: str) -> str:
-        return re.sub(pattern, repl, line)
+        return compiled.sub(repl, line)
     return inner
@@ -5,13 +5,10 @@ import subprocess
 
 from . import dist, log, util
 
-SYSTEMCTL_BIN_PATH = "/usr/bin/systemctl"
-if dist.get_distro().deb_based:
-    SYSTEMCTL_BIN_PATH = "/bin/systemctl"
+_IS_DEB_BASED = dist.get_distro().deb_based
 
-SYSTEMCTL_SERVICES_PATH = "/etc/systemd/system"
-if dist.get_distro().deb_based:
-    SYSTEMCTL_SERVICES_PATH = "/lib/systemd/system"
+SYSTEMCTL_BIN_PATH = "/bin/systemctl" if _IS_DEB_BASED else "/usr/bin/systemctl"
+SYSTEMCTL_SERVICES_PATH = "/lib/systemd/system" if _IS_DEB_BASED else "/etc/systemd/system"
 
 
 def is_service_exists(service: str) -> bool:
@@ -33,8 +30,8 @@ def get_required_services(service: str) -> typing.List[str]:
         universal_newlines=True
     )
 
-    required_services = [service for service in res.stdout.split('s=')[1].split() if '.service' in service]
-    return required_services
+    _, _, value = res.stdout.partition('Requires=')
+    return [service for service in value.split() if '.service' in service]
 
 
 def is_service_masked(service: str) -> bool:
@@ -56,6 +53,11 @@ def is_service_startable(
         service: str,
         already_checked: typing.Optional[typing.Set[str]] = None
         ) -> bool:
+    # A service gets into already_checked only after it was found existing and not masked,
+    # so there is no need to ask systemctl about it again when it is required by several services
+    if already_checked is not None and service in already_checked:
+        return True
+
     if not is_service_exists(service):
         log.debug(f"Service '{service}' doesn't exist")
         return False
@@ -63,9 +65,6 @@ def is_service_startable(
         log.debug(f"Service '{service}' can't be started because it is masked")
         return False
 
-    if already_checked is not None and service in already_checked:
-        return True
-
     if already_checked is None:
         already_checked = {service}
     else:
@@ -79,12 +78,54 @@ def is_service_startable(
     return True
 
 
+def _list_unit_files() -> typing.Set[str]:
+    # Masked units are left out, so the per-service check still decides about them
+    res = subprocess.run(
+        [SYSTEMCTL_BIN_PATH, 'list-unit-files', '--no-legend', '--no-pager'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True
+    )
+    if res.returncode != 0:
+        return set()
+
+    unit_files = set()
+    for line in res.stdout.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and fields[1] != "masked":
+            unit_files.add(fields[0])
+    return unit_files
+
+
+_UNIT_TYPES = frozenset((
+    "service", "socket", "device", "mount", "automount", "swap",
+    "target", "path", "timer", "slice", "scope",
+))
+
+
+def _get_unit_file_name(service: str) -> str:
+    # systemctl treats names without a unit type suffix as services, like "mariadb" is "mariadb.service"
+    if service.rpartition(".")[2] in _UNIT_TYPES:
+        return service
+    return service + ".service"
+
+
+def _filter_existing_services(services: typing.List[str]) -> typing.List[str]:
+    if len(services) <= 1:
+        return [service for service in services if is_service_exists(service)]
+
+    # One listing of unit files is cheaper than calling "systemctl cat" for every service.
+    # Services missing from the list (aliases, instances) are still checked one by one.
+    unit_files = _list_unit_files()
+    return [service for service in services if _get_unit_file_name(service) in unit_files or is_service_exists(service)]
+
+
 def reload_systemd_daemon():
     util.logged_check_call([SYSTEMCTL_BIN_PATH, "daemon-reload"])
 
 
 def start_services(services: typing.List[str]):
-    existed_services = [service for service in services if is_service_exists(service)]
+    existed_services = _filter_existing_services(services)
     if not existed_services:
         return
 
@@ -92,7 +133,7 @@ def start_services(services: typing.List[str]):
 
 
 def stop_services(services: typing.List[str]):
-    existed_services = [service for service in services if is_service_exists(service)]
+    existed_services = _filter_existing_services(services)
     if not existed_services:
         return
 
@@ -100,7 +141,7 @@ def stop_services(services: typing.List[str]):
 
 
 def enable_services(services: typing.List[str]):
-    existed_services = [service for service in services if is_service_exists(service)]
+    existed_services = _filter_existing_services(services)
     if not existed_services:
         return
 
@@ -108,7 +149,7 @@ def enable_services(services: typing.List[str]):
 
 
 def disable_services(services: typing.List[str]):
-    existed_services = [service for service in services if is_service_exists(service)]
+    existed_services = _filter_existing_services(services)
     if not existed_services:
         return
 
@@ -116,7 +157,7 @@ def disable_services(services: typing.List[str]):
 
 
 def restart_services(services: typing.List[str]):
-    existed_services = [service for service in services if is_service_exists(service)]
+    existed_services = _filter_existing_services(services)
     if not existed_services:
         return
 
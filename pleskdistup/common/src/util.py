@@ -1,7 +1,11 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 
+import codecs
+import io
+import locale
+import os
+import selectors
 import subprocess
-from select import select
 import typing
 
 from . import log
@@ -40,6 +44,57 @@ def logged_check_call(cmd: typing.Union[typing.Sequence[str], str], **kwargs) ->
     return log_outputs_check_call(cmd, collect_return_stdout=True, **kwargs)
 
 
+def _read_single_pipe(
+    cmd: typing.Union[typing.Sequence[str], str],
+    process: subprocess.Popen,
+    pipe: typing.Optional[typing.IO[str]],
+    process_line: typing.Callable[[str], None],
+) -> int:
+    # With only one pipe to read there is nothing to multiplex, so just block on reading it
+    # until the process closes it. Nothing written right before the exit is lost this way.
+    if not pipe:
+        raise RuntimeError(f"Cannot get process output of command {cmd!r}")
+    for line in pipe:
+        process_line(line)
+    return process.wait()
+
+
+def _read_both_pipes(
+    cmd: typing.Union[typing.Sequence[str], str],
+    process: subprocess.Popen,
+    process_stdout_line: typing.Callable[[str], None],
+    process_stderr_line: typing.Callable[[str], None],
+) -> int:
+    if not process.stdout or not process.stderr:
+        raise RuntimeError(f"Cannot get process output of command {cmd!r}")
+
+    # Wait until any of the pipes has data instead of polling them. The raw descriptors are read
+    # directly, because data kept in the text wrappers' buffers is invisible to select.
+    encoding = locale.getpreferredencoding(False)
+    pending: typing.Dict[int, str] = {}
+    with selectors.DefaultSelector() as selector:
+        for pipe, process_line in ((process.stdout, process_stdout_line), (process.stderr, process_stderr_line)):
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+            selector.register(pipe.fileno(), selectors.EVENT_READ, (decoder, process_line))
+            pending[pipe.fileno()] = ""
+
+        while selector.get_map():
+            for key, _ in selector.select():
+                decoder, process_line = key.data
+                data = os.read(key.fd, 65536)
+                lines = (pending[key.fd] + decoder.decode(data, final=not data)).split("\n")
+                pending[key.fd] = lines.pop()
+                for line in lines:
+                    process_line(line + "\n")
+
+                if not data:
+                    if pending[key.fd]:
+                        process_line(pending[key.fd])
+                    selector.unregister(key.fd)
+
+    return process.wait()
+
+
 def exec_get_output_streamed(
     cmd: typing.Union[typing.Sequence[str], str],
     process_stdout_line: typing.Optional[typing.Callable[[str], None]],
@@ -57,26 +112,15 @@ def exec_get_output_streamed(
     kwargs["universal_newlines"] = True
 
     process = subprocess.Popen(cmd, **kwargs)
-    if process_stdout_line is None and process_stderr_line is None:
-        process.communicate()
-        return process.returncode
-
-    while process.poll() is None:
-        if process_stdout_line is not None:
-            if not process.stdout:
-                raise RuntimeError(f"Cannot get process stdout of command {cmd!r}")
-            if select([process.stdout], [], [], 0.0)[0]:
-                line = process.stdout.readline()
-                if line:
-                    process_stdout_line(line)
-        if process_stderr_line is not None:
-            if not process.stderr:
-                raise RuntimeError(f"Cannot get process stderr of command {cmd!r}")
-            if select([process.stderr], [], [], 0.0)[0]:
-                line = process.stderr.readline()
-                if line:
-                    process_stderr_line(line)
-    return process.returncode
+    if process_stderr_line is None:
+        if process_stdout_line is None:
+            # Both streams go to /dev/null, so there is nothing to drain
+            return process.wait()
+        return _read_single_pipe(cmd, process, process.stdout, process_stdout_line)
+    elif process_stdout_line is None:
+        return _read_single_pipe(cmd, process, process.stderr, process_stderr_line)
+
+    return _read_both_pipes(cmd, process, process_stdout_line, process_stderr_line)
 
 
 def merge_dicts_of_lists(
@@ -1,6 +1,13 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
 
+import re
 import typing
+from functools import lru_cache
+
+# Matches the same letters as str.isalpha()
+_FIRST_ALPHA_RE = re.compile(r"[^\W\d_]")
+# A dash followed by a digit separates a package name prefix from the version
+_VERSION_START_RE = re.compile(r"-(?=\d)")
 
 
 class KernelVersion():
@@ -33,16 +40,16 @@ class KernelVersion():
             return
 
         # Long format of kernel version
-        for iter in range(len(secondary_part)):
-            if secondary_part[iter].isalpha():
-                self.build = secondary_part[:iter - 1]
-                suffix = secondary_part[iter:]
-                # There is no information about arch when we have vzX suffix
-                if suffix.startswith("vz"):
-                    self.distro = suffix.split(".")[0]
-                else:
-                    self.distro, self.arch = suffix.rsplit(".", 1)
-                break
+        alpha_match = _FIRST_ALPHA_RE.search(secondary_part)
+        if alpha_match is not None:
+            # The separator between the build and the distro part is dropped
+            self.build = secondary_part[:alpha_match.start() - 1]
+            suffix = secondary_part[alpha_match.start():]
+            # There is no information about arch when we have vzX suffix
+            if suffix.startswith("vz"):
+                self.distro = suffix.partition(".")[0]
+            else:
+                self.distro, self.arch = suffix.rsplit(".", 1)
 
     def _extract_no_build(self, version: str) -> None:
         self.build = ""
@@ -59,12 +66,16 @@ class KernelVersion():
         self.major, self.minor, self.patch = main_part.split(".")
 
     def _remove_prefix(self, version: str) -> str:
-        while not version[0].isdigit():
-            version = version.split("-", 1)[-1]
-        return version
+        if version[:1].isdigit():
+            return version
 
-    def __init__(self, version: str):
-        """Initialize a KernelVersion object."""
+        # Package name prefix could contain dashes too, like "kernel-plus-3.10.0"
+        start_match = _VERSION_START_RE.search(version)
+        if start_match is None:
+            raise ValueError(f"Cannot find kernel version in '{version}'")
+        return version[start_match.end():]
+
+    def _parse(self, version: str) -> None:
         self.major = "0"
         self.minor = "0"
         self.patch = "0"
@@ -80,6 +91,10 @@ class KernelVersion():
         else:
             self._extract_no_build(version)
 
+    def __init__(self, version: str):
+        """Initialize a KernelVersion object."""
+        self.major, self.minor, self.patch, self.build, self.distro, self.arch = _parse_kernel_version(version)
+
     def __repr__(self) -> str:
         attrs = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items())
         return f"{self.__class__.__name__}({attrs})"
@@ -114,6 +129,15 @@ class KernelVersion():
         return not self.__lt__(other)
 
 
+@lru_cache(maxsize=1024)
+def _parse_kernel_version(version: str) -> typing.Tuple[str, str, str, str, str, str]:
+    # Package lists contain the same versions many times, so every string is parsed only once.
+    # Only the parsed fields are shared, each KernelVersion object still gets its own copy.
+    parsed = KernelVersion.__new__(KernelVersion)
+    parsed._parse(version)
+    return (parsed.major, parsed.minor, parsed.patch, parsed.build, parsed.distro, parsed.arch)
+
+
 class PHPVersion():
     """Php version representation class."""
 
@@ -138,8 +162,7 @@ class PHPVersion():
         self.major = int(version_part[0])
         self.minor = int(version_part[1])
 
-    def __init__(self, to_extract: str):
-        """Initialize a KernelVersion object."""
+    def _parse(self, to_extract: str) -> None:
         self.major = 0
         self.minor = 0
 
@@ -152,6 +175,10 @@ class PHPVersion():
         else:
             raise ValueError(f"Cannot extract php version from '{to_extract}'")
 
+    def __init__(self, to_extract: str):
+        """Initialize a KernelVersion object."""
+        self.major, self.minor = _parse_php_version(to_extract)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(major={self.major!r}, minor={self.minor!r})"
 
@@ -171,6 +198,13 @@ class PHPVersion():
         return hash((self.major, self.minor))
 
 
+@lru_cache(maxsize=1024)
+def _parse_php_version(to_extract: str) -> typing.Tuple[int, int]:
+    parsed = PHPVersion.__new__(PHPVersion)
+    parsed._parse(to_extract)
+    return (parsed.major, parsed.minor)
+
+
 class PleskVersion:
     """
     Plesk version representation class.
@@ -0,0 +1,48 @@
+# Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import subprocess
+import unittest
+from unittest import mock
+
+import src.dpkg as dpkg
+
+
+class FilterInstalledPackagesTests(unittest.TestCase):
+    def _filter(self, pkgs, dpkg_query_output):
+        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=dpkg_query_output)
+        with mock.patch("subprocess.run", return_value=result) as run_mock:
+            filtered = dpkg.filter_installed_packages(pkgs)
+        return filtered, run_mock
+
+    def test_empty_list(self):
+        filtered, run_mock = self._filter([], "")
+        self.assertEqual(filtered, [])
+        run_mock.assert_not_called()
+
+    def test_not_installed_packages_are_skipped(self):
+        filtered, run_mock = self._filter(
+            ["bash", "removed", "missing"],
+            "bash amd64 installed\nremoved amd64 config-files\n",
+        )
+        self.assertEqual(filtered, ["bash"])
+        run_mock.assert_called_once()
+
+    def test_arch_qualified_names(self):
+        filtered, _ = self._filter(
+            ["libc6:amd64", "bash", "libc6:i386"],
+            "libc6 amd64 installed\nbash amd64 installed\n",
+        )
+        self.assertEqual(filtered, ["libc6:amd64", "bash"])
+
+    def test_bare_name_of_multiarch_package(self):
+        filtered, _ = self._filter(
+            ["libc6"],
+            "libc6 amd64 installed\nlibc6 i386 installed\n",
+        )
+        self.assertEqual(filtered, ["libc6"])
+
+    def test_requested_order_is_kept(self):
+        filtered, _ = self._filter(
+            ["zlib1g", "bash"],
+            "bash amd64 installed\nzlib1g amd64 installed\n",
+        )
+        self.assertEqual(filtered, ["zlib1g", "bash"])
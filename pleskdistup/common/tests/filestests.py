@@ -389,6 +389,25 @@ class FindFileSubstring(unittest.TestCase):
         self.assertEqual(files.find_file_substrings(self.temp_file, "no_such_substring"), [])
 
 
+class GetLastLines(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_file = tempfile.mkstemp()[1]
+        with open(self.temp_file, "w") as f:
+            f.write("first\n")
+            f.write("second\n")
+            f.write("third\n")
+
+    def tearDown(self) -> None:
+        os.remove(self.temp_file)
+
+    def test_last_lines(self):
+        self.assertEqual(files.get_last_lines(self.temp_file, 2), ["second\n", "third\n"])
+
+    def test_more_lines_than_file_has(self):
+        self.assertEqual(files.get_last_lines(self.temp_file, 5), ["first\n", "second\n", "third\n"])
+
+
 class CNFSetVariable(unittest.TestCase):
 
     TEST_FILE_CONTENT = """
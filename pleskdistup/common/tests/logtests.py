@@ -45,3 +45,17 @@ class TestLog(unittest.TestCase):
         self.assertTrue(os.path.exists(self.DEFAULT_LOG_STORE))
         with open(self.DEFAULT_LOG_STORE, "r") as log_file:
             self.assertTrue("Test message \\xfc" in log_file.read())
+
+    def test_reinit_drops_previous_handlers(self):
+        second_log_store = "test_second.log"
+        try:
+            log.init_logger([self.DEFAULT_LOG_STORE, second_log_store], [], console=False)
+            log.init_logger([self.DEFAULT_LOG_STORE], [], console=False)
+            log.err("Test message")
+            with open(self.DEFAULT_LOG_STORE, "r") as log_file:
+                self.assertEqual(log_file.read().count("Test message"), 1)
+            with open(second_log_store, "r") as log_file:
+                self.assertEqual("", log_file.read())
+        finally:
+            if os.path.exists(second_log_store):
+                os.unlink(second_log_store)
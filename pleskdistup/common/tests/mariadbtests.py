@@ -61,3 +61,13 @@ class MariaDBVersionsTests(unittest.TestCase):
         maria_ver1 = mariadb.MariaDBVersion("5.2.2")
         maria_ver2 = mariadb.MariaDBVersion("6.1.1")
         self.assertLess(maria_ver1, maria_ver2)
+
+    def test_compare_greater_minor_less_patch(self):
+        maria_ver1 = mariadb.MariaDBVersion("10.4.1")
+        maria_ver2 = mariadb.MariaDBVersion("10.3.20")
+        self.assertGreater(maria_ver1, maria_ver2)
+        self.assertGreaterEqual(maria_ver1, maria_ver2)
+
+    def test_hash_equal_versions(self):
+        versions = {mariadb.MariaDBVersion("10.6.12"), mariadb.MariaDBVersion("mysql  Ver 15.1 Distrib 10.6.12-MariaDB, for debian-linux-gnu (x86_64)")}
+        self.assertEqual(len(versions), 1)
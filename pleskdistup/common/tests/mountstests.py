@@ -90,3 +90,42 @@ class FstabMisorderingTests(unittest.TestCase):
             f.write("/dev/sda4 /home ext4 defaults 0 1\n")
 
         self.assertEqual(mounts.get_fstab_configuration_misorderings(self.test_file_path), [])
+
+    def test_indented_comment_and_blank_lines(self):
+        with open(self.test_file_path, "w") as f:
+            f.write("   # indented comment\n")
+            f.write("/dev/sda2 /var ext4 defaults 0 1\n")
+            f.write("  \n")
+            f.write("/dev/sda1 / ext4 defaults 0 1\n")
+        self.assertEqual(mounts.get_fstab_configuration_misorderings(self.test_file_path), [("/", "/var")])
+
+    def test_similar_prefix_mount_points(self):
+        with open(self.test_file_path, "w") as f:
+            f.write("/dev/sda1 / ext4 defaults 0 1\n")
+            f.write("/dev/sda5 /home/test ext4 defaults 0 1\n")
+            f.write("/dev/sda6 /home-old ext4 defaults 0 1\n")
+            f.write("/dev/sda4 /home ext4 defaults 0 1\n")
+        self.assertEqual(mounts.get_fstab_configuration_misorderings(self.test_file_path), [("/home", "/home/test")])
+
+    def test_nested_misorderings_nearest_parent_first(self):
+        with open(self.test_file_path, "w") as f:
+            f.write("/dev/sda3 /var/log ext4 defaults 0 1\n")
+            f.write("/dev/sda1 / ext4 defaults 0 1\n")
+            f.write("/dev/sda2 /var ext4 defaults 0 1\n")
+        self.assertEqual(mounts.get_fstab_configuration_misorderings(self.test_file_path), [("/var", "/var/log"), ("/", "/var/log")])
+
+
+class ReadFstabEntriesTests(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = tempfile.mktemp()
+
+    def test_read_entries(self):
+        with open(self.test_file_path, "w") as f:
+            f.write("# comment\n")
+            f.write("/dev/sda1 / ext4 defaults 0 1\n")
+            f.write("\n")
+            f.write("  /dev/md0 /var ext4 defaults 0 1\n")
+        self.assertEqual(list(mounts.read_fstab_entries(self.test_file_path)), [
+            mounts.FstabEntry(line_number=1, device="/dev/sda1", mount_point="/", line="/dev/sda1 / ext4 defaults 0 1"),
+            mounts.FstabEntry(line_number=3, device="/dev/md0", mount_point="/var", line="/dev/md0 /var ext4 defaults 0 1"),
+        ])
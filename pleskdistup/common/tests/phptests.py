@@ -174,3 +174,9 @@ class TestGetPHPCondition(unittest.TestCase):
                     version.PHPVersion("7.4"),
                 ]
         )
+
+    def test_changing_result_does_not_affect_next_calls(self):
+        php.get_php_versions_by_condition(lambda php: php.major == 5)[0].major = 9
+        php.get_known_php_versions()[0].minor = 9
+        self.assertEqual(php.get_known_php_versions()[0], version.PHPVersion("5.2"))
+        self.assertEqual(len(php.get_php_versions_by_condition(lambda php: php.major == 9)), 0)
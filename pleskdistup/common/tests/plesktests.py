@@ -1,4 +1,5 @@
 # Copyright 2023-2025. WebPros International GmbH. All rights reserved.
+import os
 import unittest
 
 from src import dist, plesk, version
@@ -90,6 +91,27 @@ class TestProductsFileParser(unittest.TestCase):
         self.assertEqual([], plesk.extract_plesk_versions(data))
 
 
+class TestPleskVersionFile(unittest.TestCase):
+    VERSION_FILE_NAME = "psa.version"
+
+    def setUp(self):
+        self.original_version_file = plesk.PLESK_VERSION_FILE
+        plesk.PLESK_VERSION_FILE = self.VERSION_FILE_NAME
+        plesk._read_plesk_version_file.cache_clear()
+
+    def tearDown(self):
+        plesk.PLESK_VERSION_FILE = self.original_version_file
+        plesk._read_plesk_version_file.cache_clear()
+        if os.path.exists(self.VERSION_FILE_NAME):
+            os.remove(self.VERSION_FILE_NAME)
+
+    def test_version_from_file(self):
+        with open(self.VERSION_FILE_NAME, "w") as f:
+            f.write("18.0.60 CentOS 7 1800240405.10\n")
+
+        self.assertEqual(version.PleskVersion("18.0.60"), plesk.get_plesk_version_fast())
+
+
 class TestGetRepositoryByOsFromInf3(unittest.TestCase):
     DEFAULT_TEST_DATA = """
 <addon id="php73" name="PHP v 7.3">
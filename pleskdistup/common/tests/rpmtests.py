@@ -209,6 +209,19 @@ gpgcheck=0
             self.assertEqual(file.read(), expected_content)
 
 
+class ExtractRepodataTests(unittest.TestCase):
+    REPO_FILE_NAME = "repo_file.txt"
+
+    def tearDown(self):
+        if os.path.exists(self.REPO_FILE_NAME):
+            os.remove(self.REPO_FILE_NAME)
+
+    def test_only_newlines_split_lines(self):
+        with open(self.REPO_FILE_NAME, "w") as f:
+            f.write("[repo1]\nname=repo\x0c1\nbaseurl=http://repo1\nenabled=1\x1e\n")
+        self.assertEqual([("repo1", "repo\x0c1", "http://repo1", None, None, ["enabled=1\x1e\n"])], list(rpm.extract_repodata(self.REPO_FILE_NAME)))
+
+
 class WriteRepodataTests(unittest.TestCase):
     REPO_FILE_CONTENT = """[repo1]
 name=repo1
@@ -349,14 +362,18 @@ class HandleRpmnewFilesTests(unittest.TestCase):
             "test2.txt": "3",
             "test2.txt.rpmnew": "4",
             "test3.txt": "5",
-            "test4.txt.rpmnew": "6"
+            "test4.txt.rpmnew": "6",
+            "test5.txt": "7",
+            "test5.txt.RPMNEW": "8",
         }
 
         expected_files = {
             "test1.txt": "2",
             "test2.txt": "4",
             "test3.txt": "5",
-            "test4.txt": "6"
+            "test4.txt": "6",
+            "test5.txt": "7",
+            "test5.txt.RPMNEW": "8",
         }
 
         for file, content in original_files.items():
@@ -367,8 +384,9 @@ class HandleRpmnewFilesTests(unittest.TestCase):
 
         for file, content in expected_files.items():
             full_filepath = os.path.join(self.test_dir, file)
-            # since test3.txt was not substituted, it should not be in the result
-            if file != "test3.txt":
+            # test3.txt has no rpmnew file, and rpm never creates upper case suffixes like test5.txt has,
+            # so these files are not substituted and should not be in the result
+            if file not in ("test3.txt", "test5.txt", "test5.txt.RPMNEW"):
                 self.assertTrue(full_filepath in result)
             else:
                 self.assertFalse(full_filepath in result)
@@ -58,3 +58,18 @@ class TestDictOfListsMerge(unittest.TestCase):
             ),
             {"a": [1, 2, 3, 7, 8, 9], "b": [4, 5, 6], "c": [10, 11, 12]}
         )
+
+
+class TestExecGetOutputStreamed(unittest.TestCase):
+    def test_both_streams(self):
+        stdout, stderr = [], []
+        code = util.exec_get_output_streamed(["/bin/sh", "-c", "echo out1; echo err1 >&2; echo out2; printf tail; exit 3"], stdout.append, stderr.append)
+        self.assertEqual(code, 3)
+        self.assertEqual(stdout, ["out1\n", "out2\n", "tail"])
+        self.assertEqual(stderr, ["err1\n"])
+
+    def test_only_stdout(self):
+        stdout = []
+        code = util.exec_get_output_streamed(["/bin/sh", "-c", "echo out1; echo err1 >&2; echo out2"], stdout.append, None)
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout, ["out1\n", "out2\n"])
@@ -162,6 +162,27 @@ class KernelVersionTests(unittest.TestCase):
 
         self.assertEqual([str(k) for k in kernels], expected)
 
+    def test_kernel_parse_multipart_prefix(self):
+        kernel = version.KernelVersion("kernel-plus-core-3.10.0-1160.el7.x86_64")
+        self.assertEqual(str(kernel), "3.10.0-1160.el7.x86_64")
+
+    def test_kernel_parse_without_version(self):
+        with self.assertRaises(ValueError):
+            version.KernelVersion("kernel-core")
+
+    def test_same_string_gives_independent_objects(self):
+        kernel1 = version.KernelVersion("3.10.0-1160.95.1.el7.x86_64")
+        kernel2 = version.KernelVersion("3.10.0-1160.95.1.el7.x86_64")
+        self.assertIsNot(kernel1, kernel2)
+
+        kernel1.build = "1"
+        self.assertEqual(kernel2.build, "1160.95.1")
+        self.assertEqual(str(version.KernelVersion("3.10.0-1160.95.1.el7.x86_64")), "3.10.0-1160.95.1.el7.x86_64")
+
+    def test_repr_keeps_fields_order(self):
+        kernel = version.KernelVersion("3.10.0-1160.el7.x86_64")
+        self.assertEqual(repr(kernel), "KernelVersion(major='3', minor='10', patch='0', build='1160', distro='el7', arch='x86_64')")
+
 
 class PHPVersionTests(unittest.TestCase):
 
@@ -229,6 +250,11 @@ class PHPVersionTests(unittest.TestCase):
         php2 = version.PHPVersion("PHP 5.2")
         self.assertGreater(php1, php2)
 
+    def test_wrong_string_raises_every_time(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                version.PHPVersion("wrong")
+
 
 class PleskVersionTests(unittest.TestCase):
 
@@ -161,10 +161,10 @@ def handle_error(
     print(error)
     print(messages.FAIL_MESSAGE_HEAD.format(logfile_path=logfile_path), end='')
 
-    error_message = f"[{util_name}] (dist-upgrader {pleskdistup.config.revision}, upgrader module {upgrader.upgrader_name} {upgrader.upgrader_version}) process has failed. Error: {error}\n\n"
-    for line in files.get_last_lines(logfile_path, 100):
+    last_log_lines = files.get_last_lines(logfile_path, 100)
+    for line in last_log_lines:
         print(line, end='')
-        error_message += line
+    error_message = f"[{util_name}] (dist-upgrader {pleskdistup.config.revision}, upgrader module {upgrader.upgrader_name} {upgrader.upgrader_version}) process has failed. Error: {error}\n\n" + "".join(last_log_lines)
 
     # When adding something to the additional_message, remember to include '\n' at the beginning.
     # This is because the FAIL_MESSAGE_TAIL contains the additional_message at the end of the previous line,